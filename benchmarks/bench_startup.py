@@ -0,0 +1,86 @@
+"""Import-time & construction-cost benchmark for e2e.api.
+
+Guards the startup cost of short-lived checks which only model an API. Exits
+non-zero if either measurement exceeds its budget, e.g.::
+
+    python benchmarks/bench_startup.py --import-budget-ms 50
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import timeit
+
+# Benchmark the checkout this script is in, from whichever directory it's run
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+from e2e.api import RestApi, endpoint
+print(time.perf_counter() - start)
+"""
+
+CONSTRUCT_SETUP = """
+from e2e.api import RestApi, endpoint
+api = RestApi("http://localhost")
+users = endpoint.JsonEndpoint(api, "/api/v1/users")
+"""
+
+
+def time_import(runs: int) -> float:
+    """Gets the median seconds to import e2e.api in a fresh interpreter."""
+    samples = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", IMPORT_SNIPPET],
+                check=True,
+                cwd=ROOT,
+                stdout=subprocess.PIPE,
+                universal_newlines=True,
+            ).stdout
+        )
+        for _ in range(runs)
+    ]
+    return statistics.median(samples)
+
+
+def time_extend(number: int) -> float:
+    """Gets the best seconds per `BasicEndpoint.extend()` call."""
+    timer = timeit.Timer("users.extend(1337)", setup=CONSTRUCT_SETUP)
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def main() -> int:
+    """Runs the benchmark, returning the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--number", type=int, default=100000)
+    parser.add_argument("--import-budget-ms", type=float, default=50.0)
+    parser.add_argument("--extend-budget-us", type=float, default=5.0)
+    args = parser.parse_args()
+
+    import_ms = time_import(args.runs) * 1e3
+    extend_us = time_extend(args.number) * 1e6
+    print(
+        "import e2e.api: {:.2f} ms (budget {} ms)".format(
+            import_ms, args.import_budget_ms
+        )
+    )
+    print(
+        "extend():       {:.3f} us (budget {} us)".format(
+            extend_us, args.extend_budget_us
+        )
+    )
+
+    if import_ms > args.import_budget_ms or extend_us > args.extend_budget_us:
+        print("Over budget!")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,51 @@
 """e2e.api: REST API Wrappers & Modeling for test & check purposes."""
 
-from . import decorators
-from . import endpoint
-from . import exceptions
-from .api import RestApi
+import importlib
+import sys
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import List
+
+# Submodules (and `requests`) are only imported on first use, keeping
+# `import e2e.api` cheap for short-lived checks.
+_SUBMODULES = (
+    "api",
+    "base",
+    "batch",
+    "decorators",
+    "endpoint",
+    "exceptions",
+    "types",
+)
+_ATTRIBUTES = {"RestApi": "api"}
+
+__all__ = ["RestApi", *_SUBMODULES]
+
+
+def __getattr__(name: str) -> Any:
+    """Imports submodules and public attributes on first access."""
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    if name in _ATTRIBUTES:
+        module = importlib.import_module("." + _ATTRIBUTES[name], __name__)
+        globals()[name] = getattr(module, name)
+        return globals()[name]
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__() -> List[str]:
+    """Lists the lazily-loaded names alongside the loaded ones."""
+    return sorted({*globals(), *__all__})
+
+
+if TYPE_CHECKING or sys.version_info < (3, 7):  # pragma: no cover
+    # Type checkers need the real names, and module-level __getattr__
+    # (PEP 562) is unavailable before 3.7, so import eagerly there.
+    from . import api
+    from . import base
+    from . import batch
+    from . import decorators
+    from . import endpoint
+    from . import exceptions
+    from . import types
+    from .api import RestApi
@@ -17,23 +17,25 @@ any service-specific behaviour. For example,
 - Extra health checks on responses (e.g. if a ``res.success` is ``False``).
 """
 
-import json
 import logging
-import pprint
-import re
-import textwrap
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import Dict
 from typing import Optional
 from urllib.parse import urlsplit
 from urllib.parse import urlunsplit
 
-import requests
-
 from . import base
 from . import exceptions
 from . import types
 
+# `requests` and the formatting modules are imported where used, so that
+# modelling an API does not pay for them until a request is made.
+if TYPE_CHECKING:  # pragma: no cover
+    import textwrap
+
+    import requests
+
 # TODO: Use e2e.common once available
 # from e2e.common import check_type
 
@@ -68,7 +70,9 @@ class RestApi(base.ClassInfo):
         EXC_INDENT_STEP = 4
 
         @classmethod
-        def __get_textwrapper(cls, level: int) -> textwrap.TextWrapper:
+        def __get_textwrapper(cls, level: int) -> "textwrap.TextWrapper":
+            import textwrap  # pylint: disable=import-outside-toplevel
+
             return textwrap.TextWrapper(
                 width=79 - (cls.EXC_INDENT_STEP * level),
                 break_long_words=True,
@@ -92,10 +96,14 @@ class RestApi(base.ClassInfo):
         self,
         api_root: str,
         timeout: float = 10.0,
-        session: Optional[requests.Session] = None,
+        session: Optional["requests.Session"] = None,
         **persistent_kwargs: Any
     ) -> None:
-        self._session = session if session is not None else requests.Session()
+        if session is None:
+            import requests  # pylint: disable=import-outside-toplevel
+
+            session = requests.Session()
+        self._session = session
         self._api_root = api_root
         self._persistent_kwargs = {"timeout": timeout, **persistent_kwargs}
 
@@ -112,13 +120,13 @@ class RestApi(base.ClassInfo):
         return RestApi.normalize_url(self._api_root)
 
     @property
-    def headers(self) -> requests.structures.CaseInsensitiveDict:
+    def headers(self) -> "requests.structures.CaseInsensitiveDict":
         """Gets the headers for this API session."""
         headers = self._session.headers  # type: requests.structures.CaseInsensitiveDict
         return headers
 
     @property
-    def cookies(self) -> requests.cookies.RequestsCookieJar:
+    def cookies(self) -> "requests.cookies.RequestsCookieJar":
         """Gets the current cookies for this API session."""
         cookies = self._session.cookies  # type: requests.cookies.RequestsCookieJar
         return cookies
@@ -130,7 +138,7 @@ class RestApi(base.ClassInfo):
         expected_status: Optional[types.StatusCodeOrSeq] = None,
         status_msg: Optional[str] = None,
         **kwargs: Any
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Base request method providing additional controls.
 
         Uses this `RestApi`'s default timeout for the request.
@@ -162,6 +170,8 @@ class RestApi(base.ClassInfo):
                 is raised while making the request.
 
         """
+        import requests  # pylint: disable=import-outside-toplevel
+
         exp_status_codes = (
             (expected_status,) if isinstance(expected_status, int) else expected_status
         )
@@ -189,6 +199,10 @@ class RestApi(base.ClassInfo):
             raise exceptions.IncompleteRequestError(msg) from e
 
         if exp_status_codes and r.status_code not in exp_status_codes:
+            # pylint: disable=import-outside-toplevel
+            import json
+            import pprint
+
             msg = "Unexpected status ({} {}) from '{} {}'\n".format(
                 r.status_code, r.reason, method, req_url
             )
@@ -217,7 +231,7 @@ class RestApi(base.ClassInfo):
         expected_status: Optional[types.StatusCodeOrSeq] = None,
         status_msg: Optional[str] = None,
         **kwargs: Any
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Uses GET as the `method` for :py:meth:`~api.RestApi.request`."""
         return self.request("GET", uri, expected_status, status_msg, **kwargs)
 
@@ -227,7 +241,7 @@ class RestApi(base.ClassInfo):
         expected_status: Optional[types.StatusCodeOrSeq] = None,
         status_msg: Optional[str] = None,
         **kwargs: Any
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Uses POST as the `method` for :py:meth:`~api.RestApi.request`."""
         return self.request("POST", uri, expected_status, status_msg, **kwargs)
 
@@ -237,7 +251,7 @@ class RestApi(base.ClassInfo):
         expected_status: Optional[types.StatusCodeOrSeq] = None,
         status_msg: Optional[str] = None,
         **kwargs: Any
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Uses PUT as the `method` for :py:meth:`~api.RestApi.request`."""
         return self.request("PUT", uri, expected_status, status_msg, **kwargs)
 
@@ -247,7 +261,7 @@ class RestApi(base.ClassInfo):
         expected_status: Optional[types.StatusCodeOrSeq] = None,
         status_msg: Optional[str] = None,
         **kwargs: Any
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Uses PATCH as the `method` for :py:meth:`~api.RestApi.request`."""
         return self.request("PATCH", uri, expected_status, status_msg, **kwargs)
 
@@ -257,7 +271,7 @@ class RestApi(base.ClassInfo):
         expected_status: Optional[types.StatusCodeOrSeq] = None,
         status_msg: Optional[str] = None,
         **kwargs: Any
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Uses DELETE as the `method` for :py:meth:`~api.RestApi.request`."""
         return self.request("DELETE", uri, expected_status, status_msg, **kwargs)
 
@@ -267,7 +281,7 @@ class RestApi(base.ClassInfo):
         expected_status: Optional[types.StatusCodeOrSeq] = None,
         status_msg: Optional[str] = None,
         **kwargs: Any
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Uses OPTIONS as the `method` for :py:meth:`~api.RestApi.request`."""
         return self.request("OPTIONS", uri, expected_status, status_msg, **kwargs)
 
@@ -285,6 +299,8 @@ class RestApi(base.ClassInfo):
         Returns:
             The provided URL, normalized.
         """
+        import re  # pylint: disable=import-outside-toplevel
+
         default_ports = [("https", 443), ("http", 80)]
         parsed = urlsplit(url)
         if (parsed.scheme, parsed.port) in default_ports:
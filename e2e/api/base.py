@@ -6,6 +6,9 @@ from typing import Any
 class ClassInfo:
     """Methods for common class info."""
 
+    # Keep subclasses free to use compact __slots__ layouts.
+    __slots__ = ()
+
     @property
     def __fqualname__(self) -> str:
         """Gets the fully-qualified name for this class."""
@@ -0,0 +1,802 @@
+"""Client-side write batching into a service's batch endpoint.
+
+Many services expose a batch endpoint which accepts several operations in a
+single call. :class:`~batch.BatchWriter` queues individual writes and flushes
+them as one batch request whenever a size, byte or time threshold is hit.
+
+Each queued write immediately returns a :class:`concurrent.futures.Future`
+which resolves to that operation's own `requests.Response`, demultiplexed from
+the batch response. Per-operation status checks behave as they do for
+:py:meth:`~api.RestApi.request`, raising
+:exc:`~e2e.api.exceptions.UnexpectedStatusError` from ``Future.result()``.
+
+The batch envelope is pluggable, see :class:`~batch.BatchFormat`. Writes are
+usually made through a :class:`~batch.BatchEndpoint`, for example,
+
+    with batch.BatchWriter(my_service, "/api/v1/$batch") as writer:
+        users = writer.endpoint("/api/v1/users")
+        futures = [users.post(json=user, expected_status=201) for user in new]
+    created = [f.result().json() for f in futures]
+"""
+
+import http
+import json
+import logging
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from urllib.parse import urlencode
+
+import requests
+
+from . import base
+from . import exceptions
+from . import types
+from .api import RestApi
+from .endpoint import BasicEndpoint
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BatchOperation:
+    """A single queued write, waiting to be sent as part of a batch.
+
+    Args:
+        method: HTTP method (``'POST'``, ``'PATCH'``, etc.).
+        uri: The relative API URI (eg. ``'/api/v2/comments'``).
+        expected_status: The expected HTTP status codes of this operation's
+            sub-result. May be a single int or a tuple/list of ints.
+        status_msg: Message to include if
+            :exc:`~e2e.api.exceptions.UnexpectedStatusError` is raised.
+        ``**kwargs``: Request details for the operation, one of
+            :attr:`~batch.BatchOperation.SUPPORTED_KWARGS`. ``data`` may be
+            bytes, a string, or form fields as a dict or a sequence of pairs.
+
+    Raises:
+        TypeError: If other request kwargs (e.g. ``files`` or ``auth``) or an
+            unsupported ``data`` type (e.g. a file object) are given, since
+            they can't be sent within a batch.
+    """
+
+    SUPPORTED_KWARGS = ("json", "data", "headers", "params")
+
+    def __init__(
+        self,
+        method: str,
+        uri: str,
+        expected_status: Optional[types.StatusCodeOrSeq] = None,
+        status_msg: Optional[str] = None,
+        **kwargs: Any
+    ) -> None:
+        unsupported = sorted(set(kwargs).difference(self.SUPPORTED_KWARGS))
+        if unsupported:
+            raise TypeError(
+                "Unsupported request kwargs for a batched operation: {}".format(
+                    ", ".join(unsupported)
+                )
+            )
+        data = kwargs.get("data")
+        if not (
+            data is None
+            or isinstance(data, (bytes, str, dict))
+            or self._is_form_pairs(data)
+        ):
+            raise TypeError(
+                "Unsupported data for a batched operation, expected bytes, str, "
+                "dict or a sequence of pairs: {!r}".format(type(data))
+            )
+
+        self.method = method.upper()
+        self.uri = uri
+        self.expected_status = (
+            (expected_status,) if isinstance(expected_status, int) else expected_status
+        )
+        self.status_msg = status_msg
+        self.kwargs = kwargs
+        self.future = Future()  # type: Future[requests.Response]
+
+    @property
+    def target(self) -> str:
+        """Gets the relative URI of the operation, including any query."""
+        params = self.kwargs.get("params")
+        if not params:
+            return self.uri
+        return "{}?{}".format(self.uri, urlencode(params, doseq=True))
+
+    @property
+    def body(self) -> Optional[bytes]:
+        """Gets the encoded body of the operation, if it has one."""
+        if self.kwargs.get("json") is not None:
+            return json.dumps(self.kwargs["json"]).encode("utf-8")
+        data = self.kwargs.get("data")
+        if data is None:
+            return None
+        if isinstance(data, bytes):
+            return data
+        if isinstance(data, str):
+            return data.encode("utf-8")
+        return urlencode(data, doseq=True).encode("utf-8")
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Gets the headers of the operation, including an implied type."""
+        headers = dict(self.kwargs.get("headers") or {})
+        if self.kwargs.get("json") is not None:
+            headers.setdefault("Content-Type", "application/json")
+        elif not isinstance(self.kwargs.get("data"), (type(None), bytes, str)):
+            headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+        return headers
+
+    @staticmethod
+    def _is_form_pairs(data: Any) -> bool:
+        """Gets whether `data` is form fields given as a sequence of pairs."""
+        return isinstance(data, (list, tuple)) and all(
+            isinstance(pair, (list, tuple)) and len(pair) == 2 for pair in data
+        )
+
+
+class BatchFormat(base.ClassInfo):
+    """Base class for batch envelope formats.
+
+    A format encodes each operation separately (so that its size can be
+    tracked while queueing), then joins the encoded operations into the
+    arguments for the batch request. On the way back, it splits the batch
+    response into one `requests.Response` per operation, in order.
+    """
+
+    def encode_operation(self, operation: BatchOperation) -> bytes:
+        """Encodes a single operation for inclusion in a batch."""
+        raise NotImplementedError
+
+    def build_request(self, encoded: List[bytes]) -> Dict[str, Any]:
+        """Gets the :meth:`~api.RestApi.request` kwargs for the batch."""
+        raise NotImplementedError
+
+    def split_response(
+        self, response: requests.Response, operations: List[BatchOperation]
+    ) -> List[requests.Response]:
+        """Splits the batch response into the operations' sub-results.
+
+        All sub-results in the response should be returned, in order; the
+        caller checks that there is exactly one for each operation.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def make_response(
+        status_code: int,
+        headers: Optional[Dict[str, str]] = None,
+        content: bytes = b"",
+        reason: Optional[str] = None,
+        batch_response: Optional[requests.Response] = None,
+    ) -> requests.Response:
+        """Builds a `requests.Response` for a demultiplexed sub-result."""
+        sub = requests.Response()
+        sub.status_code = status_code
+        if reason is None:
+            try:
+                reason = http.HTTPStatus(status_code).phrase
+            except ValueError:
+                reason = ""
+        sub.reason = reason
+        sub.headers = requests.structures.CaseInsensitiveDict(headers or {})
+        # Content is always read up-front for sub-results
+        sub._content = content  # pylint: disable=protected-access
+        sub.encoding = requests.utils.get_encoding_from_headers(sub.headers)
+        if batch_response is not None:
+            sub.url = batch_response.url
+            sub.elapsed = batch_response.elapsed
+            sub.request = batch_response.request
+        return sub
+
+
+class JsonArrayFormat(BatchFormat):
+    """Batch envelope as a JSON array of operations.
+
+    Each operation is sent as an object with ``method``, ``url``, ``headers``
+    and ``body`` members. The response is expected to be a JSON array of the
+    same length, with ``status``, ``headers`` and ``body`` members. The member
+    names may be changed via the class attributes.
+
+    Non-JSON bodies are sent as strings, so they must be UTF-8 text. Binary
+    ``data`` is rejected with a `ValueError` when queued; use
+    :class:`~batch.MultipartMixedFormat` to batch binary bodies.
+    """
+
+    METHOD_KEY = "method"
+    URL_KEY = "url"
+    HEADERS_KEY = "headers"
+    BODY_KEY = "body"
+    STATUS_KEY = "status"
+
+    def encode_operation(self, operation: BatchOperation) -> bytes:
+        item = {
+            self.METHOD_KEY: operation.method,
+            self.URL_KEY: operation.target,
+        }  # type: Dict[str, Any]
+        if operation.headers:
+            item[self.HEADERS_KEY] = operation.headers
+        if operation.kwargs.get("json") is not None:
+            item[self.BODY_KEY] = operation.kwargs["json"]
+        elif operation.body is not None:
+            try:
+                item[self.BODY_KEY] = operation.body.decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise ValueError(
+                    "{} can only send UTF-8 text bodies, got binary data for "
+                    "'{} {}'".format(
+                        self.__fqualname__, operation.method, operation.target
+                    )
+                ) from e
+        return json.dumps(item).encode("utf-8")
+
+    def build_request(self, encoded: List[bytes]) -> Dict[str, Any]:
+        return {
+            "data": b"[" + b",".join(encoded) + b"]",
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    def split_response(
+        self, response: requests.Response, operations: List[BatchOperation]
+    ) -> List[requests.Response]:
+        try:
+            items = response.json()
+        except ValueError as e:
+            raise exceptions.MalformedBatchResponseError(
+                response, "Batch response body is not JSON"
+            ) from e
+        if not isinstance(items, list):
+            raise exceptions.MalformedBatchResponseError(
+                response, "Batch response body is not a JSON array"
+            )
+
+        subs = []
+        for item in items:
+            if not isinstance(item, dict) or self.STATUS_KEY not in item:
+                raise exceptions.MalformedBatchResponseError(
+                    response,
+                    "Batch item is not an object with a {!r} member: {!r}".format(
+                        self.STATUS_KEY, item
+                    ),
+                )
+            try:
+                status_code = int(item[self.STATUS_KEY])
+                headers = dict(item.get(self.HEADERS_KEY) or {})
+            except (TypeError, ValueError) as e:
+                raise exceptions.MalformedBatchResponseError(
+                    response, "Bad status or headers in batch item: {!r}".format(item)
+                ) from e
+            body = item.get(self.BODY_KEY)
+            if body is None:
+                content = b""
+            elif isinstance(body, str):
+                content = body.encode("utf-8")
+            else:
+                content = json.dumps(body).encode("utf-8")
+                headers.setdefault("Content-Type", "application/json")
+            subs.append(
+                self.make_response(
+                    status_code,
+                    headers,
+                    content,
+                    batch_response=response,
+                )
+            )
+        return subs
+
+
+class MultipartMixedFormat(BatchFormat):
+    """Batch envelope as ``multipart/mixed`` with ``application/http`` parts.
+
+    Each operation is sent as a raw HTTP request in its own part, as used by
+    OData and several Google APIs. The response is expected to be
+    ``multipart/mixed`` with one raw HTTP response per part, in order.
+    """
+
+    CRLF = b"\r\n"
+
+    def __init__(self, boundary: Optional[str] = None) -> None:
+        self.boundary = boundary or "batch_{}".format(uuid.uuid4().hex)
+
+    def encode_operation(self, operation: BatchOperation) -> bytes:
+        lines = [
+            b"Content-Type: application/http",
+            b"Content-Transfer-Encoding: binary",
+            b"",
+            "{} {} HTTP/1.1".format(operation.method, operation.target).encode(),
+        ]
+        lines += [
+            "{}: {}".format(k, v).encode("utf-8") for k, v in operation.headers.items()
+        ]
+        lines += [b"", operation.body or b""]
+        return self.CRLF.join(lines)
+
+    def build_request(self, encoded: List[bytes]) -> Dict[str, Any]:
+        delimiter = b"--" + self.boundary.encode()
+        body = b"".join(delimiter + self.CRLF + part + self.CRLF for part in encoded)
+        return {
+            "data": body + delimiter + b"--" + self.CRLF,
+            "headers": {
+                "Content-Type": "multipart/mixed; boundary={}".format(self.boundary)
+            },
+        }
+
+    def split_response(
+        self, response: requests.Response, operations: List[BatchOperation]
+    ) -> List[requests.Response]:
+        content_type = response.headers.get("Content-Type", "")
+        boundary = None
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "boundary":
+                boundary = value.strip('"')
+        if not content_type.lower().startswith("multipart/") or not boundary:
+            raise exceptions.MalformedBatchResponseError(
+                response, "Batch response is not multipart: {!r}".format(content_type)
+            )
+
+        delimiter = b"--" + boundary.encode()
+        body = response.content.split(delimiter + b"--")[0]
+        # The first chunk is the preamble, before the first delimiter. Only
+        # the CRLFs around each delimiter belong to it (RFC 2046), the rest
+        # is part content.
+        parts = [self._strip_crlf(part) for part in body.split(delimiter)[1:]]
+
+        subs = []
+        for part in parts:
+            _, http_message = self._split_headers(response, part)
+            status_line, rest = (http_message.split(self.CRLF, 1) + [b""])[:2]
+            headers, content = self._split_headers(response, rest)
+            try:
+                _, status, reason = (status_line.decode().split(" ", 2) + [""])[:3]
+                status_code = int(status)
+            except ValueError as e:
+                raise exceptions.MalformedBatchResponseError(
+                    response, "Bad status line in batch part: {!r}".format(status_line)
+                ) from e
+            subs.append(
+                self.make_response(
+                    status_code, headers, content, reason or None, response
+                )
+            )
+        return subs
+
+    def _strip_crlf(self, part: bytes) -> bytes:
+        """Removes one leading and one trailing CRLF from a part."""
+        if part.startswith(self.CRLF):
+            part = part[len(self.CRLF) :]
+        if part.endswith(self.CRLF):
+            part = part[: -len(self.CRLF)]
+        return part
+
+    def _split_headers(
+        self, response: requests.Response, message: bytes
+    ) -> Tuple[Dict[str, str], bytes]:
+        """Splits raw headers from the body following them."""
+        separator = self.CRLF * 2
+        if message.startswith(self.CRLF):
+            return {}, message[len(self.CRLF) :]
+        if separator not in message:
+            if not message.strip():
+                return {}, b""
+            raise exceptions.MalformedBatchResponseError(
+                response, "Batch part has no header/body separator"
+            )
+        raw_headers, content = message.split(separator, 1)
+        headers = {}
+        for line in raw_headers.decode("utf-8").split("\r\n"):
+            key, _, value = line.partition(":")
+            if key:
+                headers[key.strip()] = value.strip()
+        return headers, content
+
+
+_Batch = List[Tuple[BatchOperation, bytes]]
+
+
+class BatchWriter(base.ClassInfo):
+    """Queues writes and sends them to a batch endpoint in bulk.
+
+    A batch is flushed when `max_operations` or `max_bytes` would be exceeded,
+    or `max_delay` seconds after the first write was queued. Flushing also
+    happens on :py:meth:`~batch.BatchWriter.flush`, on
+    :py:meth:`~batch.BatchWriter.close` and when leaving a ``with`` block.
+
+    Writes are queued through :py:meth:`~batch.BatchWriter.endpoint` or the
+    request methods, which mirror :class:`~e2e.api.RestApi` but return
+    futures. Batched results can't be converted before they exist, so wrap
+    ``future.result()`` in a :class:`~e2e.api.decorators.ResponseDict` where
+    a :class:`~e2e.api.endpoint.JsonEndpoint` would have been used.
+
+    If the batch request itself fails, the exception is set on every future
+    in that batch rather than raised from the flush.
+
+    Batches are sent one at a time, in the order they were formed, by
+    whichever thread formed one while no other batch was being sent (the
+    delay timer's thread for `max_delay`). Queueing further writes does not
+    wait for a batch in flight.
+
+    Args:
+        api: The :class:`~e2e.api.RestApi` to send batches through.
+        batch_uri: The relative URI of the service's batch endpoint.
+        batch_format: The envelope format, a :class:`~batch.JsonArrayFormat`
+            by default.
+        max_operations: Most operations to send in one batch.
+        max_bytes: Most encoded operation bytes to send in one batch.
+        max_delay: Most seconds an operation may wait to be sent, or ``None``
+            to only flush on the other thresholds.
+        expected_status: Expected status codes of the batch request itself.
+        ``**kwargs``: Additional arguments for each batch request.
+    """
+
+    def __init__(
+        self,
+        api: RestApi,
+        batch_uri: str,
+        batch_format: Optional[BatchFormat] = None,
+        max_operations: int = 100,
+        max_bytes: int = 1024 * 1024,
+        max_delay: Optional[float] = 1.0,
+        expected_status: Optional[types.StatusCodeOrSeq] = (200, 207),
+        **kwargs: Any
+    ) -> None:
+        self._api = api
+        self._batch_uri = batch_uri
+        self._format = batch_format if batch_format is not None else JsonArrayFormat()
+        self._max_operations = max_operations
+        self._max_bytes = max_bytes
+        self._max_delay = max_delay
+        self._expected_status = expected_status
+        self._batch_kwargs = kwargs
+
+        self._lock = threading.Lock()
+        # Notified whenever the sending thread runs out of ready batches
+        self._idle = threading.Condition(self._lock)
+        self._pending = []  # type: _Batch
+        self._pending_bytes = 0
+        self._timer = None  # type: Optional[threading.Timer]
+        # Identifies the batch being queued, so stale timers can't flush early
+        self._generation = 0
+        self._closed = False
+        # Formed batches waiting to be sent, and the thread sending them
+        self._ready = deque()  # type: Deque[_Batch]
+        self._sender = None  # type: Optional[int]
+
+    @property
+    def url(self) -> str:
+        """Gets the underlying API's root URL."""
+        return self._api.url
+
+    @property
+    def pending(self) -> int:
+        """Gets the number of operations waiting to be sent."""
+        return len(self._pending)
+
+    def request(
+        self,
+        method: str,
+        uri: str,
+        expected_status: Optional[types.StatusCodeOrSeq] = None,
+        status_msg: Optional[str] = None,
+        **kwargs: Any
+    ) -> "Future[requests.Response]":
+        """Queues an operation for the next batch.
+
+        Args:
+            method: HTTP method (``'POST'``, ``'PATCH'``, etc.).
+            uri: The relative API URI (eg. ``'/api/v2/comments'``).
+            expected_status: The expected HTTP status codes of the operation's
+                sub-result. May be a single int or a tuple/list of ints.
+            status_msg: Message to include if
+                :exc:`~e2e.api.exceptions.UnexpectedStatusError` is raised.
+            ``**kwargs``: Request details, see :class:`~batch.BatchOperation`.
+
+        Returns:
+            A future resolving to the operation's `requests.Response`. It will
+            raise :exc:`e2e.api.exceptions.UnexpectedStatusError` if the
+            sub-result's status does not match any given `expected_status`.
+
+        Raises:
+            RuntimeError: If the writer has been closed.
+        """
+        operation = BatchOperation(method, uri, expected_status, status_msg, **kwargs)
+        encoded = self._format.encode_operation(operation)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(
+                    "Cannot queue writes after {!r} is closed".format(self)
+                )
+            if self._pending and (
+                len(self._pending) >= self._max_operations
+                or self._pending_bytes + len(encoded) > self._max_bytes
+            ):
+                self._take_pending()
+            self._pending.append((operation, encoded))
+            self._pending_bytes += len(encoded)
+            if len(self._pending) >= self._max_operations:
+                self._take_pending()
+            elif self._timer is None and self._max_delay is not None:
+                self._timer = threading.Timer(
+                    self._max_delay, self._on_timer, args=(self._generation,)
+                )
+                self._timer.daemon = True
+                self._timer.start()
+            send = self._claim_sender()
+
+        if send:
+            self._send_ready()
+        return operation.future
+
+    def post(self, uri: str, **kwargs: Any) -> "Future[requests.Response]":
+        """Uses POST as the `method` for :py:meth:`~batch.BatchWriter.request`."""
+        return self.request("POST", uri, **kwargs)
+
+    def put(self, uri: str, **kwargs: Any) -> "Future[requests.Response]":
+        """Uses PUT as the `method` for :py:meth:`~batch.BatchWriter.request`."""
+        return self.request("PUT", uri, **kwargs)
+
+    def patch(self, uri: str, **kwargs: Any) -> "Future[requests.Response]":
+        """Uses PATCH as the `method` for :py:meth:`~batch.BatchWriter.request`."""
+        return self.request("PATCH", uri, **kwargs)
+
+    def delete(self, uri: str, **kwargs: Any) -> "Future[requests.Response]":
+        """Uses DELETE as the `method` for :py:meth:`~batch.BatchWriter.request`."""
+        return self.request("DELETE", uri, **kwargs)
+
+    def endpoint(self, api_uri: Union[str, BasicEndpoint]) -> "BatchEndpoint":
+        """Gets a batched view of an endpoint, queueing its writes here.
+
+        Args:
+            api_uri: The endpoint URL segment, or an existing endpoint model
+                whose URI should be used.
+        """
+        if isinstance(api_uri, BasicEndpoint):
+            api_uri = api_uri.uri
+        return BatchEndpoint(self, BasicEndpoint(self._api, api_uri))
+
+    def flush(self) -> None:
+        """Sends all queued operations now, as a single batch request.
+
+        Returns once every batch formed so far has been sent, including any
+        already in flight on another thread.
+        """
+        self._flush()
+
+    def close(self) -> None:
+        """Flushes any queued operations and stops accepting new ones.
+
+        Like :py:meth:`~batch.BatchWriter.flush`, this waits for batches in
+        flight on the delay timer's thread, so their futures are resolved
+        before e.g. a short-lived process exits.
+        """
+        self._flush(close=True)
+
+    def _flush(self, close: bool = False) -> None:
+        with self._lock:
+            self._closed = self._closed or close
+            self._take_pending()
+            send = self._claim_sender()
+        if send:
+            self._send_ready()
+
+        with self._idle:
+            # The sending thread may flush (e.g. from a future's callback),
+            # its remaining batches are sent once that returns.
+            while self._sender is not None and self._sender != threading.get_ident():
+                self._idle.wait()
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _take_pending(self) -> None:
+        """Forms a batch from the queued operations, to be sent in order.
+
+        The caller must hold the lock.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._generation += 1
+        if self._pending:
+            self._ready.append(self._pending)
+        self._pending, self._pending_bytes = [], 0
+
+    def _claim_sender(self) -> bool:
+        """Gets whether the caller should send the ready batches.
+
+        The caller must hold the lock, and call ``_send_ready()`` after
+        releasing it if this returns ``True``.
+        """
+        if self._sender is not None or not self._ready:
+            return False
+        self._sender = threading.get_ident()
+        return True
+
+    def _send_ready(self) -> None:
+        """Sends ready batches in order, until there are none left."""
+        while True:
+            with self._lock:
+                if not self._ready:
+                    self._sender = None
+                    self._idle.notify_all()
+                    return
+                batch = self._ready.popleft()
+            try:
+                self._send_batch(batch)
+            except BaseException:
+                with self._lock:
+                    self._sender = None
+                    self._idle.notify_all()
+                raise
+
+    def _on_timer(self, generation: int) -> None:
+        with self._lock:
+            # The batch this timer was started for may already have been sent
+            if generation != self._generation:
+                return
+            self._take_pending()
+            send = self._claim_sender()
+        if send:
+            self._send_ready()
+
+    def _send_batch(self, pending: "_Batch") -> None:
+        # Cancelled operations are dropped from the batch
+        pending = [p for p in pending if p[0].future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+
+        operations = [operation for operation, _ in pending]
+        LOGGER.debug("Flushing %d operation(s) to %s", len(operations), self._batch_uri)
+        try:
+            self._send(operations, [encoded for _, encoded in pending])
+        except Exception as e:  # pylint: disable=broad-except
+            for operation in operations:
+                if not operation.future.done():
+                    operation.future.set_exception(e)
+
+    def _send(self, operations: List[BatchOperation], encoded: List[bytes]) -> None:
+        request_kwargs = {**self._batch_kwargs, **self._format.build_request(encoded)}
+        if "headers" in self._batch_kwargs:
+            request_kwargs["headers"] = {
+                **self._batch_kwargs["headers"],
+                **request_kwargs["headers"],
+            }
+        response = self._api.request(
+            "POST", self._batch_uri, self._expected_status, **request_kwargs
+        )
+
+        subs = self._format.split_response(response, operations)
+        if len(subs) != len(operations):
+            raise exceptions.MalformedBatchResponseError(
+                response,
+                "Batch of {} operation(s) got {} sub-result(s)".format(
+                    len(operations), len(subs)
+                ),
+            )
+
+        for operation, sub in zip(operations, subs):
+            exp_status_codes = operation.expected_status
+            if exp_status_codes and sub.status_code not in exp_status_codes:
+                msg = "Unexpected status ({} {}) from '{} {}' in batch '{}'\n".format(
+                    sub.status_code,
+                    sub.reason,
+                    operation.method,
+                    operation.target,
+                    self._batch_uri,
+                )
+                msg += "    Response (next line):\n{}\n".format(
+                    RestApi.ExcFormatter.format(sub.text, 2)
+                )
+                if operation.status_msg:
+                    msg += "\tError Message: {}".format(operation.status_msg)
+                operation.future.set_exception(
+                    exceptions.UnexpectedStatusError(sub, msg)
+                )
+            else:
+                operation.future.set_result(sub)
+
+    def __repr__(self) -> str:
+        return "{}({!r}, {!r}, {})".format(
+            self.__fqualname__,
+            self._api,
+            self._batch_uri,
+            self._format.__fqualname__,
+        )
+
+
+class BatchEndpoint(base.ClassInfo):
+    """Endpoint model whose writes are queued on a :class:`~batch.BatchWriter`.
+
+    This mirrors the write methods of
+    :class:`~e2e.api.endpoint.BasicEndpoint`, but each returns a future for
+    the operation's `requests.Response`. Use
+    :py:meth:`~batch.BatchWriter.endpoint` to create one; a
+    :class:`~batch.BatchWriter` is not a :class:`~e2e.api.RestApi` and can't
+    be given to other endpoint models. For JSON results, as
+    :class:`~e2e.api.endpoint.JsonEndpoint` would give, wrap
+    ``future.result()`` in a :class:`~e2e.api.decorators.ResponseDict`.
+
+    Args:
+        writer: The :class:`~batch.BatchWriter` to queue writes on.
+        endpoint: The endpoint model providing the URI.
+    """
+
+    __slots__ = ("_writer", "_endpoint")
+
+    __REQ_DOC_FMT = """Queue a {} request on this endpoint.
+
+    See :py:meth:`~batch.BatchEndpoint.request` for more info.
+    """
+
+    def __init__(self, writer: BatchWriter, endpoint: BasicEndpoint) -> None:
+        self._writer = writer
+        self._endpoint = endpoint
+
+    @property
+    def uri(self) -> str:
+        """Returns this endpoint's relative URI."""
+        return self._endpoint.uri
+
+    @property
+    def url(self) -> str:
+        """Returns the endpoint's full URL."""
+        return self._endpoint.url
+
+    def extend(self, uri: str) -> "BatchEndpoint":
+        """Clone this endpoint, but with an extended URI from this one."""
+        return BatchEndpoint(self._writer, self._endpoint.extend(uri))
+
+    def request(
+        self, method: str, uri_extension: str = "", **kwargs: Any
+    ) -> "Future[requests.Response]":
+        """Queues a request on this endpoint, optionally extending the URI.
+
+        Args:
+            method: HTTP method to perform, e.g. 'POST'.
+            uri_extension: Optional, extend the URI for this endpoint (e.g.
+                for a specific ID).
+            ``**kwargs``: Passed along to :py:meth:`~batch.BatchWriter.request`.
+        """
+        # Same URI building as the endpoint model, pylint: disable=protected-access
+        uri = self._endpoint._extend_uri(uri_extension)
+        return self._writer.request(method, uri, **kwargs)
+
+    def post(
+        self, uri_extension: str = "", **kwargs: Any
+    ) -> "Future[requests.Response]":
+        return self.request("POST", uri_extension, **kwargs)
+
+    def put(
+        self, uri_extension: str = "", **kwargs: Any
+    ) -> "Future[requests.Response]":
+        return self.request("PUT", uri_extension, **kwargs)
+
+    def patch(
+        self, uri_extension: str = "", **kwargs: Any
+    ) -> "Future[requests.Response]":
+        return self.request("PATCH", uri_extension, **kwargs)
+
+    def delete(
+        self, uri_extension: str = "", **kwargs: Any
+    ) -> "Future[requests.Response]":
+        return self.request("DELETE", uri_extension, **kwargs)
+
+    post.__doc__ = __REQ_DOC_FMT.format("POST")
+    put.__doc__ = __REQ_DOC_FMT.format("PUT")
+    patch.__doc__ = __REQ_DOC_FMT.format("PATCH")
+    delete.__doc__ = __REQ_DOC_FMT.format("DELETE")
+
+    def __repr__(self) -> str:
+        return "{}({!r}, {!r})".format(self.__fqualname__, self._writer, self.uri)
@@ -1,15 +1,17 @@
 """Decorators used internally for e2e.api."""
 
 import functools
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 from typing import Dict
 from typing import TypeVar
 
-import requests
-
 from . import types
 
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
 
 # Builtin wrapper, pylint: disable=too-few-public-methods
 class ResponseDict(Dict[str, Any]):
@@ -20,13 +22,17 @@ class ResponseDict(Dict[str, Any]):
     codes, headers, etc.
     """
 
-    def __init__(self, raw_response: requests.Response) -> None:
+    __slots__ = ("response",)
+
+    def __init__(self, raw_response: "requests.Response") -> None:
         super().__init__(raw_response.json() if raw_response.content else {})
         self.response = raw_response
 
 
 # FIXME: There's probably work to be done here for type correctness
-def jsonify(responder: Callable[..., requests.Response]) -> Callable[..., ResponseDict]:
+def jsonify(
+    responder: Callable[..., "requests.Response"],
+) -> Callable[..., ResponseDict]:
     """Converts a response to a :class:`~decorators.ResponseDict`.
 
     An empty server response will be treated as an empty dict instead (and the
@@ -43,7 +49,7 @@ def jsonify(responder: Callable[..., requests.Response]) -> Callable[..., Respon
     return func_wrapper
 
 
-T_R = TypeVar("T_R", requests.Response, ResponseDict)
+T_R = TypeVar("T_R", "requests.Response", ResponseDict)
 
 
 # FIXME: There's probably work to be done here for type correctness
@@ -1,15 +1,17 @@
 """Base endpoint classes provided by e2e.api."""
 
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import Union
 from urllib.parse import urljoin
 
-import requests
-
 from . import base
 from .api import RestApi
 from .decorators import jsonify
 
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
 
 class BasicEndpoint(base.ClassInfo):
     """Establishes mappings to the basic functionality of a REST API endpoint.
@@ -22,6 +24,9 @@ class BasicEndpoint(base.ClassInfo):
             See :py:meth:`~endpoint.BasicEndpoint.set_status_checking()`.
     """
 
+    # Endpoints are created in bulk (e.g. via extend()), keep them compact.
+    __slots__ = ("_api", "_checked", "_uri")
+
     # pylint: disable=arguments-differ
     __REQ_DOC_FMT = """Perform a {} request on this endpoint.
 
@@ -65,7 +70,7 @@ class BasicEndpoint(base.ClassInfo):
     # TODO: Use Generic to make the typing more accurate for subclasses
     def extend(self, uri: str) -> "BasicEndpoint":
         """Clone this endpoint, but with an extended URI from this one."""
-        return self.__class__(self._api, self._extend_uri(uri))
+        return self.__class__(self._api, self._extend_uri(uri), self._checked)
 
     def _extend_uri(self, uri_extension: Union[int, str] = "") -> str:
         slashify = self.uri.endswith("/")
@@ -78,7 +83,7 @@ class BasicEndpoint(base.ClassInfo):
 
     def request(
         self, method: str, uri_extension: str = "", **kwargs: Any
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Performs a request on this endpoint, optionally extending the URI.
 
         You may wish to "extend" the URI for gettings specific resources, e.g.::
@@ -96,22 +101,22 @@ class BasicEndpoint(base.ClassInfo):
         """
         return self._api.request(method, self._extend_uri(uri_extension), **kwargs)
 
-    def get(self, uri_extension: str = "", **kwargs: Any) -> requests.Response:
+    def get(self, uri_extension: str = "", **kwargs: Any) -> "requests.Response":
         return self.request("GET", uri_extension, **kwargs)
 
-    def put(self, uri_extension: str = "", **kwargs: Any) -> requests.Response:
+    def put(self, uri_extension: str = "", **kwargs: Any) -> "requests.Response":
         return self.request("PUT", uri_extension, **kwargs)
 
-    def post(self, uri_extension: str = "", **kwargs: Any) -> requests.Response:
+    def post(self, uri_extension: str = "", **kwargs: Any) -> "requests.Response":
         return self.request("POST", uri_extension, **kwargs)
 
-    def patch(self, uri_extension: str = "", **kwargs: Any) -> requests.Response:
+    def patch(self, uri_extension: str = "", **kwargs: Any) -> "requests.Response":
         return self.request("PATCH", uri_extension, **kwargs)
 
-    def delete(self, uri_extension: str = "", **kwargs: Any) -> requests.Response:
+    def delete(self, uri_extension: str = "", **kwargs: Any) -> "requests.Response":
         return self.request("DELETE", uri_extension, **kwargs)
 
-    def options(self, uri_extension: str = "", **kwargs: Any) -> requests.Response:
+    def options(self, uri_extension: str = "", **kwargs: Any) -> "requests.Response":
         return self.request("OPTIONS", uri_extension, **kwargs)
 
     get.__doc__ = __REQ_DOC_FMT.format("GET")
@@ -138,6 +143,8 @@ class JsonEndpoint(BasicEndpoint):
         :py:class:`endpoint.BasicEndpoint` for more info on usage.
     """
 
+    __slots__ = ()
+
     # TODO: The type warnings are valid, fix design.
     # TODO: Intercepting only `request` right now breaks most type-hinting
 
@@ -1,6 +1,9 @@
 """Exceptions raised by e2e.api."""
 
-import requests
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
 
 
 class RestApiException(Exception):
@@ -15,7 +18,7 @@ class UnexpectedStatusError(RestApiException):
         msg: Optional additional message explaining the details of the error.
     """
 
-    def __init__(self, response: requests.Response, msg: str = ""):
+    def __init__(self, response: "requests.Response", msg: str = ""):
         super().__init__(msg)
         self.msg = msg
         self.status_code = response.status_code  # type: int
@@ -27,3 +30,20 @@ class UnexpectedStatusError(RestApiException):
 
 class IncompleteRequestError(RestApiException):
     """Raised when a request was not completed, for any reason."""
+
+
+class MalformedBatchResponseError(RestApiException):
+    """Raised when a batch response cannot be split into its sub-results.
+
+    Args:
+        response: The batch response which could not be split.
+        msg: Optional additional message explaining the details of the error.
+    """
+
+    def __init__(self, response: "requests.Response", msg: str = ""):
+        super().__init__(msg)
+        self.msg = msg
+        self.response = response
+
+    def __str__(self) -> str:
+        return self.msg
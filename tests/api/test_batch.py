@@ -0,0 +1,341 @@
+"""Tests for queueing writes into a batch endpoint."""
+
+import io
+import json
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from unittest import mock
+
+import pytest
+import pytest_mock
+import requests
+
+from e2e.api import RestApi
+from e2e.api import batch
+from e2e.api import endpoint
+from e2e.api import exceptions
+
+
+def make_response(content: bytes, content_type: str) -> requests.Response:
+    """Builds a batch response as returned by `requests.Session.request`."""
+    res = requests.Response()
+    res.status_code = 200
+    res.headers["Content-Type"] = content_type
+    res._content = content  # pylint: disable=protected-access
+    return res
+
+
+def json_results(*statuses: int) -> requests.Response:
+    """Builds a JSON array batch response echoing the status codes."""
+    items = [{"status": status, "body": {"id": i}} for i, status in enumerate(statuses)]
+    return make_response(json.dumps(items).encode(), "application/json")
+
+
+@pytest.fixture(name="mock_request")
+def mock_request_fixture(mocker: pytest_mock.MockFixture) -> mock.Mock:
+    """Mocks and patches `requests.Session.request` and returns it."""
+    mock_request = mocker.Mock()  # type: mock.Mock
+    mocker.patch("requests.Session.request", mock_request)
+    return mock_request
+
+
+def sent_items(mock_request: mock.Mock, call: int = 0) -> List[Any]:
+    """Gets the decoded JSON array sent by the given batch request."""
+    items = json.loads(mock_request.call_args_list[call][1]["data"])  # type: List[Any]
+    return items
+
+
+def test_flush_sends_one_request_and_demultiplexes(mock_request: mock.Mock) -> None:
+    """Verify that queued writes are sent together and resolved in order."""
+    mock_request.return_value = json_results(201, 200)
+    api = RestApi("http://testurl.com")
+    with batch.BatchWriter(api, "/batch", max_delay=None) as writer:
+        users = writer.endpoint(endpoint.BasicEndpoint(api, "/users"))
+        created = users.post(json={"name": "a"})
+        updated = users.patch("7", json={"name": "b"})
+        assert not mock_request.called
+
+    mock_request.assert_called_once()
+    assert mock_request.call_args[0] == ("POST", "http://testurl.com/batch")
+    assert sent_items(mock_request) == [
+        {
+            "method": "POST",
+            "url": "/users",
+            "headers": {"Content-Type": "application/json"},
+            "body": {"name": "a"},
+        },
+        {
+            "method": "PATCH",
+            "url": "/users/7",
+            "headers": {"Content-Type": "application/json"},
+            "body": {"name": "b"},
+        },
+    ]
+    assert created.result().status_code == 201
+    assert created.result().json() == {"id": 0}
+    assert updated.result().json() == {"id": 1}
+
+
+def test_max_operations_triggers_flush(mock_request: mock.Mock) -> None:
+    """Verify that a full batch is sent without waiting."""
+    mock_request.return_value = json_results(200, 200)
+    writer = batch.BatchWriter(
+        RestApi("http://testurl.com"), "/batch", max_operations=2, max_delay=None
+    )
+    futures = [writer.post("/items", json=i) for i in range(3)]
+
+    assert mock_request.call_count == 1
+    assert [f.done() for f in futures] == [True, True, False]
+    assert writer.pending == 1
+
+
+def test_max_bytes_triggers_flush(mock_request: mock.Mock) -> None:
+    """Verify that a batch is sent before it would exceed the byte limit."""
+    mock_request.return_value = json_results(200)
+    writer = batch.BatchWriter(
+        RestApi("http://testurl.com"), "/batch", max_bytes=100, max_delay=None
+    )
+    writer.post("/items", json="x" * 40)
+    writer.post("/items", json="y" * 40)
+
+    assert mock_request.call_count == 1
+    assert sent_items(mock_request)[0]["body"] == "x" * 40
+
+
+def test_max_delay_triggers_flush(mock_request: mock.Mock) -> None:
+    """Verify that a partial batch is sent after the delay."""
+    mock_request.return_value = json_results(200)
+    writer = batch.BatchWriter(RestApi("http://testurl.com"), "/batch", max_delay=0.01)
+
+    assert writer.post("/items", json={}).result(timeout=5).status_code == 200
+
+
+def test_unexpected_sub_status_raises(mock_request: mock.Mock) -> None:
+    """Verify that each operation's status is checked on its own."""
+    mock_request.return_value = json_results(201, 409)
+    with batch.BatchWriter(RestApi("http://testurl.com"), "/batch") as writer:
+        good = writer.post("/items", json={}, expected_status=201)
+        bad = writer.post("/items", json={}, expected_status=201, status_msg="dupe")
+
+    assert good.result().status_code == 201
+    with pytest.raises(exceptions.UnexpectedStatusError) as exc_info:
+        bad.result()
+    assert exc_info.value.status_code == 409
+    assert "dupe" in str(exc_info.value)
+
+
+def test_mismatched_result_count_fails_all(mock_request: mock.Mock) -> None:
+    """Verify that a batch response of the wrong size fails every operation."""
+    mock_request.return_value = json_results(200)
+    with batch.BatchWriter(RestApi("http://testurl.com"), "/batch") as writer:
+        futures = [writer.delete("/items/{}".format(i)) for i in range(2)]
+
+    for future in futures:
+        with pytest.raises(exceptions.MalformedBatchResponseError):
+            future.result()
+
+
+def test_multipart_mixed_round_trip(mock_request: mock.Mock) -> None:
+    """Verify the multipart/mixed envelope in both directions."""
+    body = (
+        b"--resp\r\n"
+        b"Content-Type: application/http\r\n\r\n"
+        b"HTTP/1.1 201 Created\r\n"
+        b"Content-Type: application/json\r\n\r\n"
+        b'{"id": 1}\r\n'
+        b"--resp\r\n"
+        b"Content-Type: application/http\r\n\r\n"
+        b"HTTP/1.1 204 No Content\r\n\r\n"
+        b"--resp--\r\n"
+    )
+    mock_request.return_value = make_response(body, "multipart/mixed; boundary=resp")
+    fmt = batch.MultipartMixedFormat(boundary="req")
+    with batch.BatchWriter(RestApi("http://testurl.com"), "/batch", fmt) as writer:
+        created = writer.post("/items", json={"a": 1})
+        deleted = writer.delete("/items/2")
+
+    kwargs = mock_request.call_args[1]
+    assert kwargs["headers"]["Content-Type"] == "multipart/mixed; boundary=req"
+    assert b"POST /items HTTP/1.1\r\nContent-Type: application/json" in kwargs["data"]
+    assert b"DELETE /items/2 HTTP/1.1\r\n" in kwargs["data"]
+    assert kwargs["data"].endswith(b"--req--\r\n")
+
+    assert created.result().status_code == 201
+    assert created.result().reason == "Created"
+    assert created.result().json() == {"id": 1}
+    assert deleted.result().status_code == 204
+    assert deleted.result().content == b""
+
+
+@pytest.mark.parametrize(
+    "items", [[1], [{"body": 1}], [{"status": "oops"}]], ids=["int", "no-status", "bad"]
+)
+def test_malformed_json_item_fails_all(mock_request: mock.Mock, items: Any) -> None:
+    """Verify that unusable batch items are reported as a malformed response."""
+    mock_request.return_value = make_response(
+        json.dumps(items).encode(), "application/json"
+    )
+    with batch.BatchWriter(RestApi("http://testurl.com"), "/batch") as writer:
+        future = writer.post("/items", json={})
+
+    with pytest.raises(exceptions.MalformedBatchResponseError):
+        future.result()
+
+
+def test_multipart_mixed_keeps_trailing_newlines(mock_request: mock.Mock) -> None:
+    """Verify that only the delimiter's CRLFs are removed from part bodies."""
+    body = (
+        b"--resp\r\n"
+        b"Content-Type: application/http\r\n\r\n"
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: text/plain\r\n\r\n"
+        b"line\n\r\n\r\n"
+        b"--resp--\r\n"
+    )
+    mock_request.return_value = make_response(body, "multipart/mixed; boundary=resp")
+    fmt = batch.MultipartMixedFormat()
+    with batch.BatchWriter(RestApi("http://testurl.com"), "/batch", fmt) as writer:
+        future = writer.put("/items/1", data="line")
+
+    assert future.result().content == b"line\n\r\n"
+
+
+def test_json_array_rejects_binary_data(mock_request: mock.Mock) -> None:
+    """Verify that non-UTF-8 data is rejected up front, and not queued."""
+    writer = batch.BatchWriter(RestApi("http://testurl.com"), "/batch")
+    with pytest.raises(ValueError, match="UTF-8"):
+        writer.post("/items", data=b"\xff\x00")
+
+    assert writer.pending == 0
+    writer.close()
+    assert not mock_request.called
+
+
+def test_writes_are_not_blocked_by_batch_in_flight(mock_request: mock.Mock) -> None:
+    """Verify that writes can be queued while a batch request is in flight."""
+    in_flight = threading.Event()
+    release = threading.Event()
+
+    def slow_batch(*_args: Any, **_kwargs: Any) -> requests.Response:
+        in_flight.set()
+        release.wait(5)
+        return json_results(200)
+
+    mock_request.side_effect = slow_batch
+    writer = batch.BatchWriter(RestApi("http://testurl.com"), "/batch", max_delay=0.01)
+    first = writer.post("/items", json={})
+    assert in_flight.wait(5)
+
+    second = writer.post("/items", json={})
+    assert writer.pending == 1
+    release.set()
+    writer.close()
+
+    assert first.result(timeout=5).status_code == 200
+    assert second.result(timeout=5).status_code == 200
+
+
+def test_closed_writer_rejects_writes(mock_request: mock.Mock) -> None:
+    """Verify that writes after close() are refused rather than queued."""
+    mock_request.return_value = json_results(200)
+    with batch.BatchWriter(RestApi("http://testurl.com"), "/batch") as writer:
+        writer.post("/items", json={})
+
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.post("/items", json={})
+    assert writer.pending == 0
+    assert mock_request.call_count == 1
+
+
+def test_endpoint_extends_uri(mock_request: mock.Mock) -> None:
+    """Verify that batched endpoints build URIs as endpoint models do."""
+    mock_request.return_value = json_results(204)
+    with batch.BatchWriter(RestApi("http://testurl.com"), "/batch") as writer:
+        users = writer.endpoint("users/")
+        assert users.url == "http://testurl.com/users/"
+        future = users.extend("7").delete()
+
+    assert sent_items(mock_request)[0]["url"] == "/users/7/"
+    assert future.result().status_code == 204
+
+
+def test_batches_are_sent_in_order(mock_request: mock.Mock) -> None:
+    """Verify that a later batch is not sent before one already in flight."""
+    in_flight = threading.Event()
+    release = threading.Event()
+    sent = []  # type: List[str]
+
+    def slow_batch(*_args: Any, **kwargs: Any) -> requests.Response:
+        items = json.loads(kwargs["data"])
+        if not in_flight.is_set():
+            in_flight.set()
+            release.wait(5)
+        sent.extend("{} {}".format(i["method"], i["url"]) for i in items)
+        return json_results(*[200] * len(items))
+
+    mock_request.side_effect = slow_batch
+    writer = batch.BatchWriter(
+        RestApi("http://testurl.com"), "/batch", max_operations=2, max_delay=0.01
+    )
+    created = writer.post("/users", json={})
+    assert in_flight.wait(5)
+
+    # Fills a batch while the timer's batch is still in flight
+    updates = [writer.patch("/users/7", json={}) for _ in range(2)]
+    release.set()
+    for future in [created, *updates]:
+        future.result(timeout=5)
+
+    assert sent == ["POST /users", "PATCH /users/7", "PATCH /users/7"]
+    writer.close()
+
+
+def test_close_waits_for_batch_in_flight(mock_request: mock.Mock) -> None:
+    """Verify that close() returns only once the timer's batch is sent."""
+    in_flight = threading.Event()
+
+    def slow_batch(*_args: Any, **_kwargs: Any) -> requests.Response:
+        in_flight.set()
+        time.sleep(0.1)
+        return json_results(200)
+
+    mock_request.side_effect = slow_batch
+    writer = batch.BatchWriter(RestApi("http://testurl.com"), "/batch", max_delay=0.01)
+    future = writer.post("/items", json={})
+    assert in_flight.wait(5)
+    writer.close()
+
+    assert future.done()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"files": {"f": b"x"}},
+        {"auth": ("user", "pass")},
+        {"cookies": {"a": "1"}},
+        {"data": io.BytesIO(b"x")},
+        {"data": ["a", "b"]},
+    ],
+    ids=["files", "auth", "cookies", "file-data", "list-data"],
+)
+def test_unsupported_kwargs_are_rejected(kwargs: Dict[str, Any]) -> None:
+    """Verify that request details which can't be batched are not dropped."""
+    writer = batch.BatchWriter(RestApi("http://testurl.com"), "/batch")
+    with pytest.raises(TypeError):
+        writer.post("/items", **kwargs)
+    assert writer.pending == 0
+
+
+def test_form_pairs_are_encoded(mock_request: mock.Mock) -> None:
+    """Verify that form data given as pairs is sent form-encoded."""
+    mock_request.return_value = json_results(200)
+    with batch.BatchWriter(RestApi("http://testurl.com"), "/batch") as writer:
+        writer.post("/items", data=[("a", "1"), ("a", "2")])
+
+    item = sent_items(mock_request)[0]
+    assert item["body"] == "a=1&a=2"
+    assert item["headers"] == {"Content-Type": "application/x-www-form-urlencoded"}
@@ -0,0 +1,88 @@
+"""Tests guarding the import & construction cost of e2e.api models."""
+
+import subprocess
+import sys
+from typing import List
+from typing import cast
+
+import pytest
+
+from e2e.api import RestApi
+from e2e.api import decorators
+from e2e.api import endpoint
+
+
+def test_import_does_not_load_requests() -> None:
+    """Verify that modelling an API does not import `requests` up front."""
+    code = (
+        "import sys\n"
+        "from e2e.api import RestApi, endpoint\n"
+        "assert 'requests' not in sys.modules, 'requests'\n"
+        "assert 'e2e.api.batch' not in sys.modules, 'batch'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "RestApi",
+        "api",
+        "base",
+        "batch",
+        "decorators",
+        "endpoint",
+        "exceptions",
+        "types",
+    ],
+)
+def test_public_attributes_resolve(name: str) -> None:
+    """Verify that lazy loading keeps every attribute e2e.api used to have."""
+    code = (
+        "import e2e.api\n"
+        "assert {0!r} in dir(e2e.api)\n"
+        "assert getattr(e2e.api, {0!r}) is not None\n".format(name)
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_endpoints_have_no_instance_dict() -> None:
+    """Verify that endpoints and ResponseDicts use a compact layout."""
+    users = endpoint.JsonEndpoint(RestApi("http://testurl.com"), "/users")
+    assert not hasattr(users, "__dict__")
+    assert not hasattr(
+        decorators.ResponseDict.__new__(decorators.ResponseDict), "__dict__"
+    )
+
+
+def test_extend_shares_state() -> None:
+    """Verify that extended endpoints keep the API and status checking."""
+    api = RestApi("http://testurl.com")
+    users = endpoint.JsonEndpoint(api, "users/", checked=False)
+    user = users.extend("1337")
+
+    assert type(user) is endpoint.JsonEndpoint
+    assert user.uri == "/users/1337/"
+    assert user._api is api  # pylint: disable=protected-access
+    assert not user._checked  # pylint: disable=protected-access
+
+
+def test_extend_runs_slotted_subclass_init() -> None:
+    """Verify that extending a slotted subclass re-runs its __init__."""
+
+    class SlottedEndpoint(endpoint.JsonEndpoint):
+        __slots__ = ("full", "seen")
+
+        def __init__(self, api: RestApi, api_uri: str, checked: bool = True) -> None:
+            super().__init__(api, api_uri, checked)
+            self.full = self.url
+            self.seen = []  # type: List[str]
+
+    slotted = SlottedEndpoint(RestApi("http://testurl.com"), "/items", checked=False)
+    clone = cast(SlottedEndpoint, slotted.extend("1"))
+
+    assert type(clone) is SlottedEndpoint
+    assert not hasattr(clone, "__dict__")
+    assert clone.full == "http://testurl.com/items/1"
+    assert clone.seen is not slotted.seen
+    assert not clone._checked  # pylint: disable=protected-access